@@ -1,7 +1,7 @@
 """
 Example usage of detect functions
 """
-from scripts.detect import detect_and_annotate, detect_and_save
+from scripts.detect import detect_and_annotate, detect_and_save, detect_only
 import cv2
 
 # Example 1: Detect from local file
@@ -20,7 +20,8 @@ output_path, results = detect_and_save('https://example.com/cat.jpg', output_pat
 # Example 5: Detect with custom confidence threshold
 annotated_img, results = detect_and_annotate('https://example.com/dog.jpg', conf=0.5)
 
-# Example 6: Access detection details
+# Example 6: Access detection details (detect_only skips drawing the boxes)
+results = detect_only('https://example.com/dog.jpg', conf=0.5)
 for box in results.boxes:
     x1, y1, x2, y2 = box.xyxy[0]  # Bounding box coordinates
     confidence = box.conf[0]       # Confidence score
@@ -6,35 +6,303 @@ Detect objects in images and return/save annotated images with bounding boxes.
 Usage:
     python scripts/detect.py --image path/to/image.jpg --output path/to/output.jpg
     python scripts/detect.py --image path/to/image.jpg  # saves to input_detected.jpg
+    python scripts/detect.py --image a.jpg b.jpg c.jpg --output out/  # batched inference
 """
 import argparse
+import ast
+import functools
+import mmap
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import cv2
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+import torch
 from ultralytics import YOLO
 
+# Run on the first GPU in FP16 when CUDA is available, otherwise FP32 on CPU
+_DEVICE = 0 if torch.cuda.is_available() else 'cpu'
+_HALF = torch.cuda.is_available()
+# Fixed inference size so TensorRT engines keep a static input shape
+IMGSZ = 640
+# Largest batch the exported TensorRT engine accepts (dynamic batch axis)
+ENGINE_MAX_BATCH = 16
+
 
 def is_url(path):
     """Check if string is a URL."""
     return isinstance(path, str) and (path.startswith('http://') or path.startswith('https://'))
 
 
-def load_image_from_url(url):
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+
+def load_image_from_url(url, session=None):
     """Download image from URL and convert to numpy array."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers, timeout=10)
-    response.raise_for_status()
-    img_array = np.asarray(bytearray(response.content), dtype=np.uint8)
+    http = session if session is not None else requests
+    with http.get(url, headers=_HEADERS, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        # Read the body straight off the socket; decode_content still handles gzip
+        data = response.raw.read(decode_content=True)
+    img_array = np.frombuffer(data, dtype=np.uint8)  # zero-copy view over the bytes
     img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
     return img
 
 
-def detect_and_annotate(image_path, model_path='runs/detect/train/weights/best.pt', conf=0.25):
+def _read_local(path):
+    """Decode a local image straight from a memory-mapped file, or None if unreadable."""
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                return cv2.imdecode(buf, cv2.IMREAD_COLOR)
+            except BaseException as e:
+                # Frames kept alive by the traceback may still reference buf
+                traceback.clear_frames(e.__traceback__)
+                raise
+            finally:
+                del buf  # release the view so the mmap can close, even if decoding raised
+    except (OSError, ValueError):  # missing or empty file
+        return None
+
+
+def _export_is_stale(export_path, model_path):
+    """True if export_path is missing or older than the weights it was built from."""
+    return not export_path.exists() or export_path.stat().st_mtime < model_path.stat().st_mtime
+
+
+def ensure_engine(model_path):
     """
-    Detect objects in an image and return annotated image with bounding boxes.
+    Return path to a TensorRT engine next to the given .pt weights.
+
+    Exports the engine (FP16, imgsz=IMGSZ) if it doesn't exist yet or is older than
+    the .pt weights (e.g. after retraining in place).
+    The engine is built with a dynamic batch axis (up to ENGINE_MAX_BATCH) so it
+    also serves detect_and_save_batch.
+    """
+    model_path = Path(model_path)
+    if model_path.suffix == '.engine':
+        return str(model_path)
+    engine_path = model_path.with_suffix('.engine')
+    if _export_is_stale(engine_path, model_path):
+        YOLO(str(model_path)).export(format='engine', half=True, imgsz=IMGSZ, dynamic=True, batch=ENGINE_MAX_BATCH)
+    return str(engine_path)
+
+
+def ensure_onnx(model_path):
+    """
+    Return path to an ONNX export next to the given .pt weights.
+
+    Exports (imgsz=IMGSZ, FP16 on GPU) if the .onnx file doesn't exist yet or is
+    older than the .pt weights.
+    """
+    model_path = Path(model_path)
+    if model_path.suffix == '.onnx':
+        return str(model_path)
+    onnx_path = model_path.with_suffix('.onnx')
+    if _export_is_stale(onnx_path, model_path):
+        YOLO(str(model_path)).export(format='onnx', half=_HALF, imgsz=IMGSZ, device=_DEVICE)
+    return str(onnx_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_model(model_path):
+    """
+    Load YOLO weights once and reuse the instance across calls.
+
+    Callers passing the same model_path share the cached model, so weights are
+    read from disk and the predictor is set up only on the first call.
+    """
+    model = YOLO(model_path, task='detect')
+    # On GPU, run one prediction at load time so CUDA context/cuDNN/TensorRT setup
+    # happens here rather than on the first real image. Skipped on CPU, where it
+    # would only add a full forward pass to every process start.
+    if _DEVICE != 'cpu':
+        model.predict(np.zeros((IMGSZ, IMGSZ, 3), dtype=np.uint8), device=_DEVICE, half=_HALF,
+                      imgsz=IMGSZ, verbose=False)
+    return model
+
+
+def _resolve_model_path(model_path):
+    """Pick the weights file for the current device."""
+    # Prefer TensorRT engine on GPU, keep .pt weights on CPU
+    if torch.cuda.is_available():
+        return ensure_engine(model_path)
+    return str(model_path)
+
+
+def _load_model(model_path):
+    """Resolve weights for the current device and return the cached model."""
+    return _get_model(_resolve_model_path(model_path))
+
+
+def load_image(image_path, session=None):
+    """Read image from URL or local path, raising ValueError if it can't be decoded."""
+    if is_url(image_path):
+        img = load_image_from_url(image_path, session)
+        if img is None:
+            raise ValueError(f"Cannot download image from URL: {image_path}")
+    else:
+        img = _read_local(image_path)
+        if img is None:
+            raise ValueError(f"Cannot read image: {image_path}")
+    return img
+
+
+def encode_image(img, ext='.jpg'):
+    """Encode an image once (format from ext, e.g. '.jpg'/'.png') and return the bytes."""
+    ok, buf = cv2.imencode(ext, img)
+    if not ok:
+        raise ValueError(f"Cannot encode image as {ext}")
+    return buf.tobytes()
+
+
+def _make_session(pool_size):
+    """requests.Session with a connection pool sized for pool_size concurrent downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def load_images_parallel(image_paths, max_workers=8, session=None):
+    """
+    Download/read many images concurrently.
+    
+    URLs share one requests.Session so connections are reused; decoding runs on
+    the worker threads too (OpenCV releases the GIL while decoding).
+    
+    Args:
+        image_paths (list[str | Path]): Paths to input images or URLs
+        max_workers (int): Number of worker threads / pooled HTTP connections
+        session (requests.Session): Session to reuse across calls (default: a new
+            one for this call only)
+    
+    Returns:
+        list of numpy.ndarray images, in input order
+    """
+    if session is None:
+        with _make_session(max_workers) as session:
+            return load_images_parallel(image_paths, max_workers, session)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda p: load_image(p, session), image_paths))
+
+
+def _default_output_path(image_path_obj, url_stem='url'):
+    """Build input_detected.ext next to a local image, or <url_stem>_detected.jpg when image_path_obj is None (URL)."""
+    if image_path_obj is None:
+        return Path(f'{url_stem}_detected.jpg')
+    return image_path_obj.parent / f"{image_path_obj.stem}_detected{image_path_obj.suffix}"
+
+
+def _print_summary(img_name, results, output_path):
+    """Print detected classes/confidences and where the output was saved."""
+    boxes = results.boxes
+    print(f"\n✅ Detected {len(boxes)} objects in {img_name}")
+    for box in boxes:
+        cls_id = int(box.cls[0])
+        conf_val = float(box.conf[0])
+        cls_name = results.names[cls_id]
+        print(f"  - {cls_name}: {conf_val:.2%}")
+    
+    print(f"💾 Saved to: {output_path}\n")
+
+
+_EMPTY_CACHE_EVERY = 100
+_call_count = 0
+
+
+def _to_cpu(results):
+    """
+    Move a result's tensors to the CPU so the GPU copies can be freed right away.
+    
+    Every _EMPTY_CACHE_EVERY results, cached CUDA blocks are also returned to the
+    driver so long-running loops don't slowly fill small GPUs.
+    """
+    global _call_count
+    if _DEVICE == 'cpu':
+        return results
+    results = results.cpu()
+    _call_count += 1
+    if _call_count % _EMPTY_CACHE_EVERY == 0:
+        torch.cuda.empty_cache()
+    return results
+
+
+@functools.lru_cache(maxsize=None)
+def _palette(nc):
+    """Fixed per-class BGR colors, computed once per number of classes."""
+    return np.random.default_rng(0).integers(0, 255, (nc, 3), dtype=np.uint8).tolist()
+
+
+def _class_name(names, cls_id):
+    """Look up a class name, falling back to the index when names is empty/incomplete."""
+    try:
+        return names[cls_id]
+    except (KeyError, IndexError):
+        return str(cls_id)
+
+
+def fast_plot(img, boxes_xyxy, cls_ids, confs, names, colors=None):
+    """
+    Draw boxes and labels onto img in place with OpenCV and return it.
+    
+    Works on plain arrays, so it serves both Ultralytics results and
+    OrtBackend.predict output. Pass a copy if the original pixels are still needed.
+    
+    Args:
+        img (numpy.ndarray): BGR image to draw on
+        boxes_xyxy (numpy.ndarray): (n, 4) boxes in pixel coordinates
+        cls_ids (numpy.ndarray): (n,) class indices
+        confs (numpy.ndarray): (n,) confidence scores
+        names (dict | list): Class index -> class name (missing ids are labelled by index)
+        colors (list): Per-class BGR colors (default: fixed palette covering all classes)
+    
+    Returns:
+        img (numpy.ndarray): The same image with boxes drawn
+    """
+    cls_ids = cls_ids.astype(int)
+    if colors is None:
+        nc = max(len(names), int(cls_ids.max()) + 1 if len(cls_ids) else 0)
+        colors = _palette(nc)
+    # Same line width / font rules as ultralytics, so labels stay readable at any image size
+    lw = max(round(sum(img.shape[:2]) / 2 * 0.003), 2)
+    tf = max(lw - 1, 1)
+    fs = lw / 3
+    for (x1, y1, x2, y2), cls_id, conf_val in zip(boxes_xyxy.astype(int).tolist(), cls_ids.tolist(),
+                                                  confs.tolist()):
+        color = colors[cls_id]
+        cv2.rectangle(img, (x1, y1), (x2, y2), color, lw, cv2.LINE_AA)
+        label = f"{_class_name(names, cls_id)} {conf_val:.2f}"
+        (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, fs, tf)
+        # Label above the box, or inside it when there's no room at the top
+        y_top = y1 - th - 3 if y1 - th - 3 >= 0 else y1
+        cv2.rectangle(img, (x1, y_top), (x1 + tw, y_top + th + 3), color, -1, cv2.LINE_AA)
+        cv2.putText(img, label, (x1, y_top + th + 1), cv2.FONT_HERSHEY_SIMPLEX, fs, (255, 255, 255), tf,
+                    cv2.LINE_AA)
+    return img
+
+
+def _plot_results(results):
+    """Draw an Ultralytics result onto a copy of its orig_img, leaving results untouched."""
+    boxes = results.boxes
+    # Copy: callers get results back and may still plot()/save_crop() from orig_img
+    return fast_plot(results.orig_img.copy(), boxes.xyxy.cpu().numpy(), boxes.cls.cpu().numpy(),
+                     boxes.conf.cpu().numpy(), results.names)
+
+
+def detect_only(image_path, model_path='runs/detect/train/weights/best.pt', conf=0.25):
+    """
+    Detect objects in an image without drawing anything.
+    
+    Use this when only the boxes are needed; it skips drawing entirely.
     
     Args:
         image_path (str): Path to input image or URL
@@ -42,29 +310,37 @@ def detect_and_annotate(image_path, model_path='runs/detect/train/weights/best.p
         conf (float): Confidence threshold (0-1)
     
     Returns:
-        annotated_img (numpy.ndarray): Image with drawn bounding boxes and labels
         results: YOLO results object with detection info
     """
-    # Load model
-    model = YOLO(model_path)
+    # Load model (cached per model_path)
+    model = _load_model(model_path)
     
     # Read image from URL or local path
-    if is_url(image_path):
-        img = load_image_from_url(image_path)
-        if img is None:
-            raise ValueError(f"Cannot download image from URL: {image_path}")
-    else:
-        img = cv2.imread(str(image_path))
-        if img is None:
-            raise ValueError(f"Cannot read image: {image_path}")
+    img = load_image(image_path)
     
     # Run inference
-    results = model.predict(source=img, conf=conf, verbose=False)
+    results = model.predict(source=img, conf=conf, device=_DEVICE, half=_HALF, imgsz=IMGSZ, verbose=False)
     
-    # Get annotated image (with boxes drawn)
-    annotated_img = results[0].plot()  # ultralytics draws boxes automatically
+    return _to_cpu(results[0])
+
+
+def detect_and_annotate(image_path, model_path='runs/detect/train/weights/best.pt', conf=0.25):
+    """
+    Detect objects in an image and return annotated image with bounding boxes.
+    
+    Args:
+        image_path (str): Path to input image or URL
+        model_path (str): Path to trained YOLO model weights
+        conf (float): Confidence threshold (0-1)
     
-    return annotated_img, results[0]
+    Returns:
+        annotated_img (numpy.ndarray): Image with drawn bounding boxes and labels
+        results: YOLO results object with detection info
+    """
+    results = detect_only(image_path, model_path, conf)
+    
+    # Get annotated image (with boxes drawn)
+    return _plot_results(results), results
 
 
 def detect_and_save(image_path, output_path=None, model_path='runs/detect/train/weights/best.pt', conf=0.25):
@@ -81,47 +357,360 @@ def detect_and_save(image_path, output_path=None, model_path='runs/detect/train/
         output_path (str): Path where image was saved
         results: Detection results
     """
+    # Resolve paths once and reuse them below
+    image_path_obj = None if is_url(image_path) else Path(image_path)
+    
     # Default output path
     if output_path is None:
-        if is_url(image_path):
-            output_path = Path('url_detected.jpg')
-        else:
-            image_path_obj = Path(image_path)
-            output_path = image_path_obj.parent / f"{image_path_obj.stem}_detected{image_path_obj.suffix}"
+        output_path = _default_output_path(image_path_obj)
+    else:
+        output_path = Path(output_path)
     
     # Detect and annotate
-    annotated_img, results = detect_and_annotate(image_path, model_path, conf)
+    results = detect_only(image_path, model_path, conf)
     
     # Save
-    cv2.imwrite(str(output_path), annotated_img)
+    output_path.write_bytes(encode_image(_plot_results(results), output_path.suffix))
     
     # Print detection summary
-    boxes = results.boxes
-    img_name = image_path if is_url(image_path) else Path(image_path).name
-    print(f"\n✅ Detected {len(boxes)} objects in {img_name}")
-    for box in boxes:
-        cls_id = int(box.cls[0])
-        conf_val = float(box.conf[0])
-        cls_name = results.names[cls_id]
-        print(f"  - {cls_name}: {conf_val:.2%}")
-    
-    print(f"💾 Saved to: {output_path}\n")
+    img_name = image_path if image_path_obj is None else image_path_obj.name
+    _print_summary(img_name, results, output_path)
     
     return str(output_path), results
 
 
+def detect_and_encode(image_path, ext='.jpg', model_path='runs/detect/train/weights/best.pt', conf=0.25):
+    """
+    Detect objects and return the annotated image as encoded bytes (e.g. for an HTTP response).
+    
+    Args:
+        image_path (str): Path to input image or URL
+        ext (str): Output format extension ('.jpg', '.png', ...)
+        model_path (str): Path to trained model
+        conf (float): Confidence threshold
+    
+    Returns:
+        data (bytes): Encoded annotated image
+        results: Detection results
+    """
+    results = detect_only(image_path, model_path, conf)
+    return encode_image(_plot_results(results), ext), results
+
+
+_warmed_batches = set()
+
+
+def detect_and_save_batch(image_paths, output_dir=None, model_path='runs/detect/train/weights/best.pt',
+                          conf=0.25, batch_size=16):
+    """
+    Detect objects in many images, running inference batch_size images at a time.
+    
+    Args:
+        image_paths (list[str | Path]): Paths to input images or URLs
+        output_dir (str): Folder for outputs (default: next to each input, url<N>_detected.jpg for URLs);
+            clashing basenames get the input index appended
+        model_path (str): Path to trained model
+        conf (float): Confidence threshold
+        batch_size (int): Number of images per model.predict call (capped at ENGINE_MAX_BATCH
+            when running a TensorRT engine)
+    
+    Returns:
+        list of (output_path, results) tuples, in input order
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    resolved_path = _resolve_model_path(model_path)
+    model = _get_model(resolved_path)
+    if resolved_path.endswith('.engine'):
+        # The engine can't take batches larger than it was exported with
+        batch_size = min(batch_size, ENGINE_MAX_BATCH)
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Warm up the GPU predictor once per batch size so the first batch isn't slow
+    # (ultralytics skips warm-up on CPU, where it only adds latency)
+    if _DEVICE != 'cpu' and (resolved_path, batch_size) not in _warmed_batches:
+        dummy = [np.zeros((IMGSZ, IMGSZ, 3), dtype=np.uint8)] * batch_size
+        model.predict(source=dummy, batch=batch_size, device=_DEVICE, half=_HALF, imgsz=IMGSZ, verbose=False)
+        _warmed_batches.add((resolved_path, batch_size))
+    
+    outputs = []
+    used_names = set()
+    # One session for the whole call so HTTP connections are reused across chunks
+    with _make_session(8) as session:
+        for start in range(0, len(image_paths), batch_size):
+            chunk = image_paths[start:start + batch_size]
+            # Download/read the whole chunk concurrently
+            imgs = load_images_parallel(chunk, 8, session)
+            
+            results = model.predict(source=imgs, batch=batch_size, conf=conf, device=_DEVICE, half=_HALF,
+                                    imgsz=IMGSZ, verbose=False)
+            
+            results = [_to_cpu(r) for r in results]
+            for i, (image_path, result) in enumerate(zip(chunk, results), start):
+                image_path_obj = None if is_url(image_path) else Path(image_path)
+                output_path = _default_output_path(image_path_obj, url_stem=f'url{i}')
+                if output_dir is not None:
+                    # Inputs from different folders can share a basename; suffix the
+                    # input index (as done for URLs) instead of overwriting
+                    name = output_path.name
+                    if name in used_names:
+                        name = f"{output_path.stem}_{i}{output_path.suffix}"
+                    used_names.add(name)
+                    output_path = output_dir / name
+                output_path.write_bytes(encode_image(_plot_results(result), output_path.suffix))
+                img_name = image_path if image_path_obj is None else image_path_obj.name
+                _print_summary(img_name, result, output_path)
+                outputs.append((str(output_path), result))
+    
+    return outputs
+
+
+def stream_detect(image_paths, model_path='runs/detect/train/weights/best.pt', conf=0.25, prefetch=4):
+    """
+    Yield detections for many images while the next ones are downloaded/decoded.
+    
+    A background thread loads images into a bounded queue so I/O overlaps with
+    inference instead of running strictly one after the other. Stopping early
+    (break/close or an exception) also stops the loader thread.
+    
+    Args:
+        image_paths (Iterable[str | Path]): Paths to input images or URLs
+        model_path (str): Path to trained model
+        conf (float): Confidence threshold
+        prefetch (int): Max number of decoded images waiting for inference
+    
+    Yields:
+        (image_path, results) tuples, in input order
+    """
+    model = _load_model(model_path)
+    q = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        # Keep retrying until there's room, giving up once the consumer has stopped
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        try:
+            for image_path in image_paths:
+                if stop.is_set() or not put((image_path, load_image(image_path))):
+                    return
+        except Exception as e:  # hand load errors to the consumer
+            put((None, e))
+            return
+        put(done)
+    
+    threading.Thread(target=produce, daemon=True).start()
+    
+    try:
+        while (item := q.get()) is not done:
+            image_path, img = item
+            if isinstance(img, Exception):
+                raise img
+            results = model.predict(source=img, conf=conf, device=_DEVICE, half=_HALF, imgsz=IMGSZ, verbose=False)
+            result = _to_cpu(results[0])
+            del results
+            yield image_path, result
+    finally:
+        stop.set()
+
+
+@functools.lru_cache(maxsize=None)
+def _numexpr():
+    """Import numexpr on first use; None if it isn't installed."""
+    try:
+        import numexpr
+    except ImportError:
+        return None
+    return numexpr
+
+
+def sigmoid(x):
+    """Elementwise logistic on a whole array (numexpr threads it when installed)."""
+    ne = _numexpr()
+    if ne is not None:
+        return ne.evaluate('1 / (1 + exp(-x))')
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+@functools.lru_cache(maxsize=None)
+def _letterbox_kernel():
+    """Build the numba letterbox kernel on first use; None if numba isn't installed."""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def letterbox_chw(img, out, top, left):
+        """Pad, BGR->RGB, HWC->CHW and /255 in a single pass over out (1, 3, S, S)."""
+        h, w = img.shape[0], img.shape[1]
+        size_h, size_w = out.shape[2], out.shape[3]
+        pad = 114 / 255.0
+        for y in prange(size_h):
+            yy = y - top
+            for x in range(size_w):
+                xx = x - left
+                if 0 <= yy < h and 0 <= xx < w:
+                    out[0, 0, y, x] = img[yy, xx, 2] / 255.0
+                    out[0, 1, y, x] = img[yy, xx, 1] / 255.0
+                    out[0, 2, y, x] = img[yy, xx, 0] / 255.0
+                else:
+                    out[0, 0, y, x] = pad
+                    out[0, 1, y, x] = pad
+                    out[0, 2, y, x] = pad
+    
+    return letterbox_chw
+
+
+class OrtBackend:
+    """
+    Run an exported YOLOv8 ONNX model with ONNX Runtime instead of Ultralytics.
+    
+    Inputs and outputs are bound with IOBinding. On CUDA the preprocessed
+    tensor is uploaded once and handed to ORT by device pointer, so the session
+    doesn't copy host buffers on every run.
+    
+    Usage:
+        backend = OrtBackend(ensure_onnx('runs/detect/train/weights/best.pt'))
+        boxes_xyxy, confs, cls_ids = backend.predict(load_image('image.jpg'))
+    """
+    
+    def __init__(self, onnx_path, imgsz=IMGSZ, logits=False):
+        import onnxruntime as ort
+        import torchvision
+        
+        self._nms = torchvision.ops.batched_nms
+        # Optional accelerators, imported here so the default Ultralytics path doesn't pay for them
+        self._letterbox_chw = _letterbox_kernel()
+        if logits:
+            _numexpr()
+        self.session = ort.InferenceSession(
+            str(onnx_path), providers=['CUDAExecutionProvider', 'CPUExecutionProvider'])
+        self.on_gpu = self.session.get_providers()[0] == 'CUDAExecutionProvider'
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        self.output_name = self.session.get_outputs()[0].name
+        self.dtype = np.float16 if inp.type == 'tensor(float16)' else np.float32
+        self.imgsz = imgsz
+        # Ultralytics exports apply sigmoid in the graph; set logits=True for heads that don't
+        self.logits = logits
+        self.io_binding = self.session.io_binding()
+        # Preprocess output buffer, reused for every image
+        self._buf = np.empty((1, 3, imgsz, imgsz), dtype=np.float32)
+        # Ultralytics stores the class names dict as a string in the model metadata
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(meta['names']) if 'names' in meta else {}
+    
+    def _resize(self, img):
+        """Resize keeping aspect ratio; return resized image, ratio and (left, top) padding."""
+        h, w = img.shape[:2]
+        r = min(self.imgsz / h, self.imgsz / w)
+        nh, nw = round(h * r), round(w * r)
+        top, left = (self.imgsz - nh) // 2, (self.imgsz - nw) // 2
+        resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        return resized, r, (left, top)
+    
+    def _preprocess(self, img):
+        """Letterbox BGR HWC uint8 into the reused RGB NCHW float32 buffer, scaled to [0, 1]."""
+        resized, r, (left, top) = self._resize(img)
+        if self._letterbox_chw is not None:
+            self._letterbox_chw(resized, self._buf, top, left)
+        else:
+            nh, nw = resized.shape[:2]
+            self._buf.fill(114 / 255.0)
+            np.multiply(resized[:, :, ::-1].transpose(2, 0, 1), np.float32(1 / 255.0),
+                        out=self._buf[0, :, top:top + nh, left:left + nw])
+        return self._buf, r, (left, top)
+    
+    def _run(self, x):
+        """Run the session on a preprocessed NCHW array and return the raw output."""
+        if self.on_gpu:
+            dtype = torch.float16 if self.dtype == np.float16 else torch.float32
+            tensor = torch.from_numpy(x).to('cuda', dtype=dtype)
+            # The upload/cast is queued on torch's stream, but ORT reads the pointer from its
+            # own stream, so wait for the copy to land before binding
+            torch.cuda.current_stream().synchronize()
+            self.io_binding.bind_input(self.input_name, 'cuda', 0, self.dtype, tuple(tensor.shape),
+                                       tensor.data_ptr())
+            self.io_binding.bind_output(self.output_name, 'cuda')
+        else:
+            self.io_binding.bind_cpu_input(self.input_name, x.astype(self.dtype, copy=False))
+            self.io_binding.bind_output(self.output_name)
+        self.session.run_with_iobinding(self.io_binding)
+        return self.io_binding.copy_outputs_to_cpu()[0]
+    
+    def _postprocess(self, out, r, pad, shape, conf, iou):
+        """Decode (1, 4 + nc, N) output into boxes in original image coordinates."""
+        pred = out[0].T.astype(np.float32)  # (N, 4 + nc)
+        scores = pred[:, 4:]
+        if self.logits:
+            scores = sigmoid(scores)
+        cls_ids = scores.argmax(axis=1)
+        confs = scores[np.arange(len(scores)), cls_ids]
+        keep = confs > conf
+        cxcywh, confs, cls_ids = pred[keep, :4], confs[keep], cls_ids[keep]
+        
+        xyxy = np.empty_like(cxcywh)
+        xyxy[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+        xyxy[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+        
+        idx = self._nms(torch.from_numpy(xyxy), torch.from_numpy(confs), torch.from_numpy(cls_ids), iou).numpy()
+        xyxy, confs, cls_ids = xyxy[idx], confs[idx], cls_ids[idx]
+        
+        # Undo letterbox
+        xyxy -= np.array([pad[0], pad[1], pad[0], pad[1]], dtype=np.float32)
+        xyxy /= r
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+        return xyxy, confs, cls_ids
+    
+    def predict(self, img, conf=0.25, iou=0.45):
+        """
+        Detect objects in a BGR image.
+        
+        Args:
+            img (numpy.ndarray): BGR image as returned by load_image
+            conf (float): Confidence threshold (0-1)
+            iou (float): NMS IoU threshold
+        
+        Returns:
+            boxes_xyxy (numpy.ndarray): (n, 4) boxes in pixel coordinates
+            confs (numpy.ndarray): (n,) confidence scores
+            cls_ids (numpy.ndarray): (n,) class indices, see self.names
+        """
+        x, r, pad = self._preprocess(img)
+        out = self._run(x)
+        return self._postprocess(out, r, pad, img.shape, conf, iou)
+
+
 def main():
     parser = argparse.ArgumentParser(description='YOLO Object Detection')
-    parser.add_argument('--image', '-i', required=True, help='Path to input image or URL')
-    parser.add_argument('--output', '-o', help='Path to output image (default: input_detected.jpg)')
+    parser.add_argument('--image', '-i', required=True, nargs='+', help='Path(s) to input image or URL')
+    parser.add_argument('--output', '-o', help='Path to output image (default: input_detected.jpg); '
+                        'output folder when several images are given')
     parser.add_argument('--model', '-m', default='runs/detect/train/weights/best.pt', 
                         help='Path to model weights')
     parser.add_argument('--conf', '-c', type=float, default=0.25, 
                         help='Confidence threshold (0-1)')
+    parser.add_argument('--batch-size', '-b', type=int, default=16,
+                        help='Images per inference batch when several images are given')
     
     args = parser.parse_args()
     
-    detect_and_save(args.image, args.output, args.model, args.conf)
+    if len(args.image) == 1:
+        detect_and_save(args.image[0], args.output, args.model, args.conf)
+    else:
+        detect_and_save_batch(args.image, args.output, args.model, args.conf, args.batch_size)
 
 
 if __name__ == '__main__':
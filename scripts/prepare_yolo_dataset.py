@@ -13,6 +13,7 @@ This script will:
 - create dest/images/train dest/images/val dest/labels/train dest/labels/val
 - split images into train/val (random)
 - copy images and their corresponding .txt labels into target folders
+  (hardlinked when on the same filesystem, so edits to either copy affect both)
 - generate data.yaml in dest/data.yaml
 - print summary
 """
@@ -20,11 +21,30 @@ import argparse
 import os
 import shutil
 import random
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import yaml
 
 def find_images(src):
     exts = ('.jpg','.jpeg','.png')
-    return [p for p in src.iterdir() if p.suffix.lower() in exts]
+    out = []
+    labels = {}
+    # One scandir pass collects both images and labels, so copy_pairs doesn't
+    # need to stat for each .txt. Only matching images get a Path.
+    # Labels are keyed by lowercased stem so IMG.jpg/img.TXT still pair up,
+    # as they did with exists() on case-insensitive filesystems (macOS).
+    with os.scandir(src) as it:
+        for e in it:
+            name = e.name
+            lower = name.lower()
+            if lower.endswith('.txt'):
+                if e.is_file():
+                    labels[lower[:-4]] = name
+            elif lower.endswith(exts) and e.is_file():
+                out.append(Path(e.path))
+    return out, labels
 
 
 def read_classes(src):
@@ -41,29 +61,65 @@ def prepare_dirs(dest):
     (dest / 'labels' / 'val').mkdir(parents=True, exist_ok=True)
 
 
-def copy_pairs(pairs, images_dst, labels_dst):
-    copied = 0
-    missing_labels = []
-    for img in pairs:
-        txt = img.with_suffix('.txt')
-        dst_img = images_dst / img.name
-        shutil.copy2(img, dst_img)
-        if txt.exists():
-            dst_txt = labels_dst / txt.name
-            shutil.copy2(txt, dst_txt)
-        else:
-            missing_labels.append(img.name)
-        copied += 1
-    return copied, missing_labels
+# GNU cp --reflink is Linux-only (BSD/macOS cp has no such flag); turned off
+# after the first failure so we don't fork a cp for every file
+_try_reflink = sys.platform.startswith('linux')
+
+
+def _fast_copy(src, dst):
+    # Hardlink when src/dst share a filesystem (no bytes move); editing either
+    # file then changes both, which is fine for a read-only training set.
+    # Otherwise try a CoW reflink, and finally a plain copy.
+    global _try_reflink
+    dst.unlink(missing_ok=True)
+    try:
+        # Resolve first: link(2) on Linux would hardlink a symlink itself, and a
+        # relative one then dangles from the new directory
+        os.link(os.path.realpath(src), dst)
+        return
+    except OSError:
+        pass
+    if _try_reflink:
+        try:
+            # --reflink=always fails (instead of silently copying) on non-CoW filesystems,
+            # so the first such failure turns this off and copy2 takes over in-process
+            subprocess.run(['cp', '--reflink=always', '--preserve=mode,timestamps', str(src), str(dst)],
+                           check=True, capture_output=True)
+            return
+        except Exception:
+            _try_reflink = False
+    shutil.copy2(src, dst)
+
+
+def _copy_one(img, labels, images_dst, labels_dst):
+    dst_img = images_dst / img.name
+    _fast_copy(img, dst_img)
+    label_name = labels.get(img.stem.lower())
+    if label_name is not None:
+        dst_txt = labels_dst / f"{img.stem}.txt"
+        _fast_copy(img.parent / label_name, dst_txt)
+        return None
+    return img.name
+
+
+def copy_pairs(pairs, labels, images_dst, labels_dst):
+    # File copies are I/O bound, so issue them concurrently
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        missing = list(executor.map(lambda img: _copy_one(img, labels, images_dst, labels_dst), pairs))
+    missing_labels = [m for m in missing if m is not None]
+    return len(missing), missing_labels
 
 
 def write_data_yaml(dest, nc, names):
-    content = f"""train: {str((dest / 'images' / 'train').resolve())}
-val: {str((dest / 'images' / 'val').resolve())}
-nc: {nc}
-names: {names}
-"""
-    (dest / 'data.yaml').write_text(content, encoding='utf-8')
+    data = {
+        'train': str((dest / 'images' / 'train').resolve()),
+        'val': str((dest / 'images' / 'val').resolve()),
+        'nc': nc,
+        'names': names,
+    }
+    # safe_dump quotes names containing quotes/colons etc. that repr() would break
+    (dest / 'data.yaml').write_text(yaml.safe_dump(data, sort_keys=False, allow_unicode=True), encoding='utf-8')
 
 
 def main():
@@ -81,7 +137,7 @@ def main():
     print('Source:', src)
     print('Destination:', dest)
 
-    imgs = find_images(src)
+    imgs, labels = find_images(src)
     if not imgs:
         print('No images found in', src)
         return
@@ -99,8 +155,8 @@ def main():
     val_imgs = imgs_sorted[:n_val]
     train_imgs = imgs_sorted[n_val:]
 
-    copied_train, missing_train = copy_pairs(train_imgs, dest / 'images' / 'train', dest / 'labels' / 'train')
-    copied_val, missing_val = copy_pairs(val_imgs, dest / 'images' / 'val', dest / 'labels' / 'val')
+    copied_train, missing_train = copy_pairs(train_imgs, labels, dest / 'images' / 'train', dest / 'labels' / 'train')
+    copied_val, missing_val = copy_pairs(val_imgs, labels, dest / 'images' / 'val', dest / 'labels' / 'val')
 
     write_data_yaml(dest, nc=len(classes), names=classes)
 